@@ -10,438 +10,731 @@ This script examines .csproj files to identify:
 - Version constraint problems
 
 Usage:
-    python analyze_dependencies.py [*.csproj-path]
+    python analyze_dependencies.py [*.csproj-path] [--json] [--no-cache]
 """
 
-import xml.etree.ElementTree as ET
+import atexit
+import concurrent.futures
+import functools
+import glob
+import io
 import json
+import logging
+import os
+import pickle
+import re
 import sys
-from pathlib import Path
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List
 
-class DotNetDependencyAnalyzer:
-    def __init__(self, csproj_path: str):
-        self.csproj_path = Path(csproj_path)
-        self.issues = {
-            'outdated': [],
-            'framework_issues': [],
-            'duplicate_functionality': [],
-            'warnings': [],
-            'configuration': []
-        }
+# Prefer lxml (libxml2) - it parses and traverses csproj files much faster
+# than the stdlib ElementTree, which re-interprets XPath in Python per call.
+try:
+    from lxml import etree as ET
+    _PARSE_ERRORS = (ET.XMLSyntaxError,)
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _PARSE_ERRORS = (ET.ParseError,)
+
+logger = logging.getLogger(__name__)
+
+
+class CsprojParseError(Exception):
+    """Raised when a .csproj file cannot be parsed."""
+
+
+# orjson serializes these analysis dicts several times faster than the
+# stdlib json module; fall back transparently when it is not installed.
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+
+# Analysis results are memoized per (resolved path, mtime_ns, size) so
+# repeated runs over unchanged csproj files skip re-parsing entirely.
+# The cache persists across invocations via a best-effort pickle file
+# that carries the analyzer version: entries written by a different
+# version of this script are discarded wholesale, so behavior changes
+# never replay stale results. Dirty entries are flushed once at
+# process exit with an atomic file swap rather than rewritten after
+# every analyze() call.
+_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'tech-debt-analyzer', 'cache.pkl')
+_CACHE_MAX_ENTRIES = 256
+# Bump whenever analysis output changes shape or content.
+_CACHE_VERSION = 2
+_analysis_cache = None
+_cache_dirty = False
+
+
+def _cache_read() -> Dict:
+    """Read cache entries from disk; anything unreadable, corrupt, or
+    written by another analyzer version counts as empty."""
+    try:
+        with open(_CACHE_PATH, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, AttributeError):
+        return {}
+    if not isinstance(payload, dict) or payload.get('version') != _CACHE_VERSION:
+        return {}
+    return payload.get('entries', {})
+
+
+def _cache_load() -> Dict:
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = _cache_read()
+    return _analysis_cache
+
+
+def _cache_put(cache_key, result: Dict):
+    cache = _cache_load()
+    # Drop stale entries for this path, then bound the cache size
+    for key in [k for k in cache if k[0] == cache_key[0]]:
+        del cache[key]
+    while len(cache) >= _CACHE_MAX_ENTRIES:
+        del cache[next(iter(cache))]  # oldest insertion first
+    cache[cache_key] = result
+    global _cache_dirty
+    _cache_dirty = True
+
+
+def _cache_flush():
+    """Write this process's cache changes back to disk, once.
+
+    Re-reads the file first so entries another worker flushed in the
+    meantime survive, then swaps the new pickle in with os.replace so
+    concurrent readers never see a torn file."""
+    global _cache_dirty
+    if not _cache_dirty or _analysis_cache is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+        entries = _cache_read()
+        entries.update(_analysis_cache)
+        while len(entries) > _CACHE_MAX_ENTRIES:
+            del entries[next(iter(entries))]
+        tmp_path = f'{_CACHE_PATH}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': _CACHE_VERSION, 'entries': entries}, f)
+        os.replace(tmp_path, _CACHE_PATH)
+        _cache_dirty = False
+    except OSError:
+        pass  # caching is best-effort; never fail the analysis
+
+
+atexit.register(_cache_flush)
+
+
+# Splits a TargetFrameworks list, stripping whitespace around the
+# separators in the same pass.
+_TFMS_SPLIT = re.compile(r'\s*;\s*')
+
+# Lookup tables shared by every analysis, built once at import time
+# instead of per call. Severity for outdated frameworks is precomputed
+# so the check is a single dict lookup.
+_OUTDATED_FRAMEWORKS = {
+    fw: ('high' if 'out of support' in msg else 'medium', msg)
+    for fw, msg in {
+        'net45': '.NET Framework 4.5 is out of support - upgrade to .NET 6/7/8',
+        'net451': '.NET Framework 4.5.1 is out of support - upgrade to .NET 6/7/8',
+        'net452': '.NET Framework 4.5.2 is out of support - upgrade to .NET 6/7/8',
+        'net46': '.NET Framework 4.6 is out of support - upgrade to .NET 6/7/8',
+        'net461': '.NET Framework 4.6.1 is out of support - upgrade to .NET 6/7/8',
+        'net462': '.NET Framework 4.6.2 is approaching end of support - plan upgrade to .NET 6/7/8',
+        'net47': '.NET Framework 4.7 is older - consider upgrading to .NET 6/7/8',
+        'net471': '.NET Framework 4.7.1 is older - consider upgrading to .NET 6/7/8',
+        'net472': '.NET Framework 4.7.2 - consider upgrading to .NET 6/7/8',
+        'net48': '.NET Framework 4.8 - consider migrating to .NET 6/7/8 for long-term support',
+        'netcoreapp2.0': '.NET Core 2.0 is out of support - upgrade to .NET 6/7/8',
+        'netcoreapp2.1': '.NET Core 2.1 is out of support - upgrade to .NET 6/7/8',
+        'netcoreapp2.2': '.NET Core 2.2 is out of support - upgrade to .NET 6/7/8',
+        'netcoreapp3.0': '.NET Core 3.0 is out of support - upgrade to .NET 6/7/8',
+        'netcoreapp3.1': '.NET Core 3.1 is out of support (Dec 2022) - upgrade to .NET 6/7/8',
+        'net5.0': '.NET 5 is out of support (May 2022) - upgrade to .NET 6/7/8',
+        'net6.0': '.NET 6 will be out of support in Nov 2024 - plan upgrade to .NET 8 LTS',
+        'net7.0': '.NET 7 is out of support (May 2024) - upgrade to .NET 8',
+    }.items()
+}
+
+_DEPRECATED_PACKAGES = {
+    'Microsoft.AspNet.Mvc': 'Use Microsoft.AspNetCore.Mvc for ASP.NET Core',
+    'Microsoft.AspNet.WebApi': 'Use Microsoft.AspNetCore.Mvc for ASP.NET Core',
+    'System.Data.SqlClient': 'Deprecated - use Microsoft.Data.SqlClient instead',
+    'Microsoft.EntityFrameworkCore.Tools.DotNet': 'Use dotnet ef global tool instead',
+    'Newtonsoft.Json': 'Consider migrating to System.Text.Json (built-in, better performance)',
+    'NLog': 'Consider Microsoft.Extensions.Logging with NLog.Extensions.Logging',
+    'log4net': 'Consider Microsoft.Extensions.Logging abstractions',
+    'AutoMapper': 'Consider Mapperly (source generator, better performance)',
+    'Moq': 'Consider NSubstitute or FakeItEasy for cleaner syntax',
+    'xunit.runner.visualstudio': 'Often unnecessary in modern .NET projects',
+}
+
+# Common duplications in .NET
+_DUPLICATION_GROUPS = (
+    (frozenset(['Newtonsoft.Json', 'System.Text.Json']), 'JSON Serialization'),
+    (frozenset(['NLog', 'Serilog', 'log4net', 'Microsoft.Extensions.Logging']), 'Logging'),
+    (frozenset(['AutoMapper', 'Mapperly', 'AgileMapper']), 'Object Mapping'),
+    (frozenset(['Moq', 'NSubstitute', 'FakeItEasy']), 'Mocking Framework'),
+    (frozenset(['xUnit', 'NUnit', 'MSTest']), 'Test Framework'),
+    (frozenset(['FluentValidation', 'DataAnnotations']), 'Validation'),
+    (frozenset(['Dapper', 'Entity Framework Core', 'NHibernate']), 'Data Access'),
+)
+
+
+# Package names and versions repeat heavily across a batch scan
+# (Microsoft.Extensions.* and friends appear in nearly every csproj), so
+# references are slotted immutable records with interned strings rather
+# than per-package dicts.
+_UNSPECIFIED = sys.intern('unspecified')
+
+
+@dataclass(slots=True, frozen=True)
+class PkgRef:
+    name: str
+    version: str
+
+
+# Issue categories in report order.
+_ISSUE_CATEGORIES = (
+    'outdated',
+    'framework_issues',
+    'duplicate_functionality',
+    'warnings',
+    'configuration',
+)
+
+
+@dataclass(slots=True)
+class Issue:
+    """A single finding, tagged with its category instead of being filed
+    into a per-category list."""
+    category: str
+    severity: str
+    message: str
+    extra: Dict = field(default_factory=dict)
+
+
+# Combined rule index over package names, compiled once at import time.
+# A single dict lookup tags a package with its deprecation notice and
+# every duplication group it belongs to, so both checks run in one pass
+# over the package list.
+_PACKAGE_RULES: Dict[str, List] = {}
+for _name, _msg in _DEPRECATED_PACKAGES.items():
+    _PACKAGE_RULES.setdefault(_name, []).append(('deprecated', _msg))
+for _idx, (_group, _label) in enumerate(_DUPLICATION_GROUPS):
+    for _name in _group:
+        _PACKAGE_RULES.setdefault(_name, []).append(('duplicate', _idx))
+del _name, _msg, _idx, _group, _label
 
-    def analyze(self):
-        """Analyze .csproj file for dependency issues."""
-        if not self.csproj_path.exists():
-            print(f"Error: {self.csproj_path} not found")
-            return None
 
+class DotNetDependencyAnalyzer:
+    def __init__(self, csproj_path: str, use_cache: bool = True):
+        # Plain strings + os.path beat pathlib.Path construction when
+        # batch scans build thousands of analyzers.
+        self.csproj_path = csproj_path
+        self.csproj_stem = os.path.splitext(os.path.basename(csproj_path))[0]
+        self.use_cache = use_cache
+        self.issues: List[Issue] = []
+
+    def analyze(self) -> Dict:
+        """Analyze .csproj file for dependency issues.
+
+        Raises FileNotFoundError if the file is missing and
+        CsprojParseError if it is not well-formed XML; presentation of
+        those failures is left to the caller."""
+        if not os.path.exists(self.csproj_path):
+            raise FileNotFoundError(f'{self.csproj_path} not found')
+
+        # Unchanged files are served from the cache; mtime/size changes
+        # invalidate the entry naturally because the key changes.
+        if self.use_cache:
+            stat = os.stat(self.csproj_path)
+            cache_key = (os.path.realpath(self.csproj_path),
+                         stat.st_mtime_ns, stat.st_size)
+            cached = _cache_load().get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self._analyze_uncached()
+        if self.use_cache:
+            _cache_put(cache_key, result)
+        return result
+
+    def _analyze_uncached(self) -> Dict:
+        """Run the full parse and all checks (cache miss path)."""
         try:
-            tree = ET.parse(self.csproj_path)
-            root = tree.getroot()
-
-            # Extract project information
-            project_info = self._extract_project_info(root)
+            # Stream the file instead of building a full DOM
+            props = self._stream_parse()
+        except _PARSE_ERRORS as e:
+            raise CsprojParseError(
+                f'Error parsing {self.csproj_path}: {e}') from e
 
-            # Get package references
-            package_refs = self._get_package_references(root)
+        # Extract project information
+        project_info = self._extract_project_info(props)
 
-            # Analyze framework targeting
-            self._check_framework_target(root)
+        # Get package references
+        package_refs = props['packages']
 
-            # Check for nullable reference types
-            self._check_nullable_configuration(root)
+        # Analyze framework targeting
+        self._check_framework_target(props)
 
-            # Check for code analysis settings
-            self._check_code_analysis(root)
+        # Check for nullable reference types
+        self._check_nullable_configuration(props)
 
-            # Check for deprecated packages
-            self._check_deprecated_packages(package_refs)
+        # Check for code analysis settings
+        self._check_code_analysis(props)
 
-            # Check for duplicate functionality
-            self._check_duplicate_functionality(package_refs)
+        # Check for deprecated packages and duplicate functionality
+        self._check_package_rules(package_refs)
 
-            # Check for version constraints
-            self._check_version_constraints(package_refs)
+        # Check for version constraints
+        self._check_version_constraints(package_refs)
 
-            return {
-                'project_name': project_info['name'],
-                'target_framework': project_info['target_framework'],
-                'sdk_style': project_info['sdk_style'],
-                'total_package_references': len(package_refs),
-                'issues': self.issues,
-                'summary': self._generate_summary()
-            }
-
-        except ET.ParseError as e:
-            print(f"Error parsing .csproj file: {e}")
-            return None
-        except Exception as e:
-            print(f"Unexpected error: {e}")
-            return None
-
-    def _extract_project_info(self, root: ET.Element) -> Dict:
-        """Extract basic project information."""
-        info = {
-            'name': self.csproj_path.stem,
-            'target_framework': 'unknown',
-            'sdk_style': 'Sdk' in root.attrib
+        return {
+            'project_name': project_info['name'],
+            'target_framework': project_info['target_framework'],
+            'sdk_style': project_info['sdk_style'],
+            'total_package_references': len(package_refs),
+            'issues': self._issues_by_category(),
+            'summary': self._generate_summary()
         }
 
-        # Find TargetFramework or TargetFrameworks
-        for prop_group in root.findall('.//PropertyGroup'):
-            tf = prop_group.find('TargetFramework')
-            if tf is not None and tf.text:
-                info['target_framework'] = tf.text
-                break
-
-            tfs = prop_group.find('TargetFrameworks')
-            if tfs is not None and tfs.text:
-                info['target_framework'] = tfs.text.split(';')[0]  # Take first
-                break
-
-        return info
-
-    def _get_package_references(self, root: ET.Element) -> List[Dict]:
-        """Extract all PackageReference elements."""
-        packages = []
-
-        for item_group in root.findall('.//ItemGroup'):
-            for pkg_ref in item_group.findall('PackageReference'):
-                include = pkg_ref.get('Include')
-                version = pkg_ref.get('Version')
-
-                # Version might be in a child element
-                if not version:
-                    version_elem = pkg_ref.find('Version')
-                    if version_elem is not None:
-                        version = version_elem.text
-
-                if include:
-                    packages.append({
-                        'name': include,
-                        'version': version or 'unspecified'
-                    })
+    def _stream_parse(self) -> Dict:
+        """Collect everything the checks need in one streaming parse.
+
+        Only a handful of PropertyGroup children and a flat
+        PackageReference list are ever used, so there is no reason to
+        keep the whole DOM alive: iterparse processes each group as its
+        end tag arrives, then clears it, keeping peak memory at roughly
+        the size of the current subtree instead of the whole file."""
+        props = {
+            'sdk_style': False,
+            'tf_first': None,         # first TargetFramework seen (wins)
+            'target_framework': [],   # text of each TargetFramework element
+            'target_frameworks': [],  # pre-split list per TargetFrameworks element
+            'nullable': [],
+            'analysis_settings': {
+                'EnableNETAnalyzers': False,
+                'TreatWarningsAsErrors': False,
+                'AnalysisLevel': None
+            },
+            'packages': []
+        }
 
-        return packages
+        # Legacy (non-SDK) csproj carry the MSBuild 2003 default
+        # namespace on every tag. Its length is measured once at the
+        # root so localnames are a constant slice; SDK-style files pay
+        # nothing.
+        root = None
+        strip = 0
+        for event, el in ET.iterparse(self.csproj_path, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = el
+                    props['sdk_style'] = 'Sdk' in el.attrib
+                    tag = el.tag
+                    if isinstance(tag, str) and tag[0] == '{':
+                        strip = tag.index('}') + 1
+                continue
+
+            tag = el.tag
+            if strip and isinstance(tag, str) and tag[0] == '{':
+                tag = tag[strip:]
+
+            if tag == 'PropertyGroup':
+                self._collect_property_group(el, props, strip)
+            elif tag == 'PackageReference':
+                self._collect_package_reference(el, props, strip)
+            elif tag not in ('Project', 'ItemGroup'):
+                continue  # leave children alive until their group ends
+
+            # Discard the processed subtree (and, with lxml, any
+            # already-consumed preceding siblings).
+            el.clear()
+            if hasattr(el, 'getprevious'):
+                parent = el.getparent()
+                while parent is not None and el.getprevious() is not None:
+                    del parent[0]
+
+        return props
+
+    def _collect_property_group(self, prop_group: ET.Element, props: Dict,
+                                strip: int = 0):
+        """Record the PropertyGroup children the checks care about."""
+        for child in prop_group:
+            text = child.text
+            if not text:
+                continue
+
+            tag = child.tag
+            if strip and isinstance(tag, str):
+                tag = tag[strip:]
+            if tag == 'TargetFramework':
+                if props['tf_first'] is None:
+                    props['tf_first'] = text
+                props['target_framework'].append(text)
+            elif tag == 'TargetFrameworks':
+                # Split once here; the framework check reuses the list
+                props['target_frameworks'].append(_TFMS_SPLIT.split(text.strip()))
+            elif tag == 'Nullable':
+                props['nullable'].append(text)
+            elif tag in ('EnableNETAnalyzers', 'TreatWarningsAsErrors'):
+                props['analysis_settings'][tag] = text.lower() == 'true'
+            elif tag == 'AnalysisLevel':
+                props['analysis_settings'][tag] = text
+
+    def _collect_package_reference(self, pkg_ref: ET.Element, props: Dict,
+                                   strip: int = 0):
+        """Record a PackageReference element."""
+        include = pkg_ref.get('Include')
+        version = pkg_ref.get('Version')
+
+        # Version might be in a child element
+        if not version:
+            for child in pkg_ref:
+                tag = child.tag
+                if strip and isinstance(tag, str):
+                    tag = tag[strip:]
+                if tag == 'Version':
+                    version = child.text
+                    break
+
+        if include:
+            props['packages'].append(PkgRef(
+                name=sys.intern(include),
+                version=sys.intern(version) if version else _UNSPECIFIED))
+
+    def _extract_project_info(self, props: Dict) -> Dict:
+        """Extract basic project information."""
+        target_framework = 'unknown'
+        if props['tf_first'] is not None:
+            target_framework = props['tf_first']
+        elif props['target_frameworks']:
+            target_framework = props['target_frameworks'][0][0]  # Take first
 
-    def _check_framework_target(self, root: ET.Element):
-        """Check for outdated framework targets."""
-        outdated_frameworks = {
-            'net45': '.NET Framework 4.5 is out of support - upgrade to .NET 6/7/8',
-            'net451': '.NET Framework 4.5.1 is out of support - upgrade to .NET 6/7/8',
-            'net452': '.NET Framework 4.5.2 is out of support - upgrade to .NET 6/7/8',
-            'net46': '.NET Framework 4.6 is out of support - upgrade to .NET 6/7/8',
-            'net461': '.NET Framework 4.6.1 is out of support - upgrade to .NET 6/7/8',
-            'net462': '.NET Framework 4.6.2 is approaching end of support - plan upgrade to .NET 6/7/8',
-            'net47': '.NET Framework 4.7 is older - consider upgrading to .NET 6/7/8',
-            'net471': '.NET Framework 4.7.1 is older - consider upgrading to .NET 6/7/8',
-            'net472': '.NET Framework 4.7.2 - consider upgrading to .NET 6/7/8',
-            'net48': '.NET Framework 4.8 - consider migrating to .NET 6/7/8 for long-term support',
-            'netcoreapp2.0': '.NET Core 2.0 is out of support - upgrade to .NET 6/7/8',
-            'netcoreapp2.1': '.NET Core 2.1 is out of support - upgrade to .NET 6/7/8',
-            'netcoreapp2.2': '.NET Core 2.2 is out of support - upgrade to .NET 6/7/8',
-            'netcoreapp3.0': '.NET Core 3.0 is out of support - upgrade to .NET 6/7/8',
-            'netcoreapp3.1': '.NET Core 3.1 is out of support (Dec 2022) - upgrade to .NET 6/7/8',
-            'net5.0': '.NET 5 is out of support (May 2022) - upgrade to .NET 6/7/8',
-            'net6.0': '.NET 6 will be out of support in Nov 2024 - plan upgrade to .NET 8 LTS',
-            'net7.0': '.NET 7 is out of support (May 2024) - upgrade to .NET 8',
+        return {
+            'name': self.csproj_stem,
+            'target_framework': target_framework,
+            'sdk_style': props['sdk_style']
         }
 
-        for prop_group in root.findall('.//PropertyGroup'):
-            tf = prop_group.find('TargetFramework')
-            if tf is not None and tf.text:
-                fw = tf.text.lower()
-                if fw in outdated_frameworks:
-                    severity = 'high' if 'out of support' in outdated_frameworks[fw] else 'medium'
-                    self.issues['framework_issues'].append({
-                        'framework': tf.text,
-                        'severity': severity,
-                        'message': outdated_frameworks[fw]
-                    })
-
-            # Check for multi-targeting
-            tfs = prop_group.find('TargetFrameworks')
-            if tfs is not None and tfs.text:
-                frameworks = tfs.text.split(';')
-                for fw in frameworks:
-                    fw = fw.strip().lower()
-                    if fw in outdated_frameworks:
-                        severity = 'medium'  # Lower severity for multi-target
-                        self.issues['framework_issues'].append({
-                            'framework': fw,
-                            'severity': severity,
-                            'message': f'Multi-targeting includes {fw}: {outdated_frameworks[fw]}'
-                        })
-
-    def _check_nullable_configuration(self, root: ET.Element):
+    def _check_framework_target(self, props: Dict):
+        """Check for outdated framework targets."""
+        if not props['target_framework'] and not props['target_frameworks']:
+            return
+
+        for tf_text in props['target_framework']:
+            entry = _OUTDATED_FRAMEWORKS.get(tf_text.lower())
+            if entry is not None:
+                severity, message = entry
+                self._add_issue('framework_issues', severity, message,
+                                framework=tf_text)
+
+        # Check for multi-targeting (lists were split at collection time)
+        for tfms in props['target_frameworks']:
+            for fw in tfms:
+                fw = fw.lower()
+                entry = _OUTDATED_FRAMEWORKS.get(fw)
+                if entry is not None:
+                    severity = 'medium'  # Lower severity for multi-target
+                    self._add_issue(
+                        'framework_issues', severity,
+                        f'Multi-targeting includes {fw}: {entry[1]}',
+                        framework=fw)
+
+    def _check_nullable_configuration(self, props: Dict):
         """Check if nullable reference types are enabled."""
-        nullable_found = False
-
-        for prop_group in root.findall('.//PropertyGroup'):
-            nullable = prop_group.find('Nullable')
-            if nullable is not None and nullable.text:
-                nullable_found = True
-                if nullable.text.lower() not in ['enable', 'annotations', 'warnings']:
-                    self.issues['configuration'].append({
-                        'setting': 'Nullable',
-                        'value': nullable.text,
-                        'severity': 'low',
-                        'message': f'Nullable is set to "{nullable.text}" - consider "enable" for better null safety'
-                    })
-
-        if not nullable_found:
-            self.issues['configuration'].append({
-                'setting': 'Nullable',
-                'value': 'not set',
-                'severity': 'medium',
-                'message': 'Nullable reference types not enabled - add <Nullable>enable</Nullable> for better null safety'
-            })
-
-    def _check_code_analysis(self, root: ET.Element):
+        # The common case - no Nullable element collected - is a single
+        # truthiness test.
+        if not props['nullable']:
+            self._add_issue(
+                'configuration', 'medium',
+                'Nullable reference types not enabled - add <Nullable>enable</Nullable> for better null safety',
+                setting='Nullable', value='not set')
+            return
+
+        for nullable_value in props['nullable']:
+            if nullable_value.lower() not in ['enable', 'annotations', 'warnings']:
+                self._add_issue(
+                    'configuration', 'low',
+                    f'Nullable is set to "{nullable_value}" - consider "enable" for better null safety',
+                    setting='Nullable', value=nullable_value)
+
+    def _check_code_analysis(self, props: Dict):
         """Check if code analysis is enabled."""
-        analysis_settings = {
-            'EnableNETAnalyzers': False,
-            'TreatWarningsAsErrors': False,
-            'AnalysisLevel': None
-        }
-
-        for prop_group in root.findall('.//PropertyGroup'):
-            for setting in analysis_settings:
-                elem = prop_group.find(setting)
-                if elem is not None and elem.text:
-                    if setting in ['EnableNETAnalyzers', 'TreatWarningsAsErrors']:
-                        analysis_settings[setting] = elem.text.lower() == 'true'
-                    else:
-                        analysis_settings[setting] = elem.text
+        analysis_settings = props['analysis_settings']
 
         if not analysis_settings['EnableNETAnalyzers']:
-            self.issues['configuration'].append({
-                'setting': 'EnableNETAnalyzers',
-                'value': 'false or not set',
-                'severity': 'medium',
-                'message': 'Code analysis not enabled - add <EnableNETAnalyzers>true</EnableNETAnalyzers>'
-            })
+            self._add_issue(
+                'configuration', 'medium',
+                'Code analysis not enabled - add <EnableNETAnalyzers>true</EnableNETAnalyzers>',
+                setting='EnableNETAnalyzers', value='false or not set')
 
         if not analysis_settings['TreatWarningsAsErrors']:
-            self.issues['configuration'].append({
-                'setting': 'TreatWarningsAsErrors',
-                'value': 'false or not set',
-                'severity': 'low',
-                'message': 'Warnings not treated as errors - consider enabling for stricter code quality'
-            })
+            self._add_issue(
+                'configuration', 'low',
+                'Warnings not treated as errors - consider enabling for stricter code quality',
+                setting='TreatWarningsAsErrors', value='false or not set')
 
-    def _check_deprecated_packages(self, packages: List[Dict]):
-        """Check for known deprecated NuGet packages."""
-        deprecated = {
-            'Microsoft.AspNet.Mvc': 'Use Microsoft.AspNetCore.Mvc for ASP.NET Core',
-            'Microsoft.AspNet.WebApi': 'Use Microsoft.AspNetCore.Mvc for ASP.NET Core',
-            'System.Data.SqlClient': 'Deprecated - use Microsoft.Data.SqlClient instead',
-            'Microsoft.EntityFrameworkCore.Tools.DotNet': 'Use dotnet ef global tool instead',
-            'Newtonsoft.Json': 'Consider migrating to System.Text.Json (built-in, better performance)',
-            'NLog': 'Consider Microsoft.Extensions.Logging with NLog.Extensions.Logging',
-            'log4net': 'Consider Microsoft.Extensions.Logging abstractions',
-            'AutoMapper': 'Consider Mapperly (source generator, better performance)',
-            'Moq': 'Consider NSubstitute or FakeItEasy for cleaner syntax',
-            'xunit.runner.visualstudio': 'Often unnecessary in modern .NET projects',
-        }
+    def _check_package_rules(self, packages: List[PkgRef]):
+        """Check for deprecated packages and duplicate functionality.
+
+        One _PACKAGE_RULES lookup per package tags it with every
+        matching rule, so both checks share a single pass."""
+        if not packages:
+            return
+
+        group_hits: Dict[int, set] = {}
 
         for pkg in packages:
-            pkg_name = pkg['name']
-            if pkg_name in deprecated:
-                # Newtonsoft.Json is common, mark as medium; others as high
-                severity = 'medium' if pkg_name == 'Newtonsoft.Json' else 'medium'
-
-                self.issues['outdated'].append({
-                    'package': pkg_name,
-                    'version': pkg['version'],
-                    'severity': severity,
-                    'message': deprecated[pkg_name]
-                })
-
-    def _check_duplicate_functionality(self, packages: List[Dict]):
-        """Check for packages that provide duplicate functionality."""
-        pkg_names = [p['name'] for p in packages]
-
-        # Common duplications in .NET
-        duplication_groups = [
-            {
-                'packages': ['Newtonsoft.Json', 'System.Text.Json'],
-                'functionality': 'JSON Serialization'
-            },
-            {
-                'packages': ['NLog', 'Serilog', 'log4net', 'Microsoft.Extensions.Logging'],
-                'functionality': 'Logging'
-            },
-            {
-                'packages': ['AutoMapper', 'Mapperly', 'AgileMapper'],
-                'functionality': 'Object Mapping'
-            },
-            {
-                'packages': ['Moq', 'NSubstitute', 'FakeItEasy'],
-                'functionality': 'Mocking Framework'
-            },
-            {
-                'packages': ['xUnit', 'NUnit', 'MSTest'],
-                'functionality': 'Test Framework'
-            },
-            {
-                'packages': ['FluentValidation', 'DataAnnotations'],
-                'functionality': 'Validation'
-            },
-            {
-                'packages': ['Dapper', 'Entity Framework Core', 'NHibernate'],
-                'functionality': 'Data Access'
-            },
-        ]
+            rules = _PACKAGE_RULES.get(pkg.name)
+            if not rules:
+                continue
+            for kind, payload in rules:
+                if kind == 'deprecated':
+                    self._add_issue('outdated', 'medium', payload,
+                                    package=pkg.name, version=pkg.version)
+                else:
+                    group_hits.setdefault(payload, set()).add(pkg.name)
 
-        for group in duplication_groups:
-            found = [pkg for pkg in group['packages'] if pkg in pkg_names]
+        for group_idx in sorted(group_hits):
+            found = sorted(group_hits[group_idx])
             if len(found) > 1:
-                self.issues['duplicate_functionality'].append({
-                    'packages': found,
-                    'functionality': group['functionality'],
-                    'severity': 'medium',
-                    'message': f'Multiple packages for {group["functionality"]}: {", ".join(found)}'
-                })
-
-    def _check_version_constraints(self, packages: List[Dict]):
+                functionality = _DUPLICATION_GROUPS[group_idx][1]
+                self._add_issue(
+                    'duplicate_functionality', 'medium',
+                    f'Multiple packages for {functionality}: {", ".join(found)}',
+                    packages=found, functionality=functionality)
+
+    def _check_version_constraints(self, packages: List[PkgRef]):
         """Check for version constraint issues."""
-        for pkg in packages:
-            version = pkg['version']
-
-            # Check for wildcard versions
-            if '*' in version:
-                self.issues['warnings'].append({
-                    'package': pkg['name'],
-                    'version': version,
-                    'severity': 'high',
-                    'message': f'Wildcard version constraint can cause unexpected breaking changes'
-                })
-
-            # Check for unspecified versions
-            if version == 'unspecified' or not version:
-                self.issues['warnings'].append({
-                    'package': pkg['name'],
-                    'version': 'not specified',
-                    'severity': 'medium',
-                    'message': 'Version not specified - use explicit versioning'
-                })
+        if not packages:
+            return
+
+        # Fast path: one substring scan over the joined versions decides
+        # whether the per-package wildcard loop needs to run at all.
+        if '*' in ';'.join(pkg.version for pkg in packages):
+            for pkg in packages:
+                if '*' in pkg.version:
+                    self._add_issue(
+                        'warnings', 'high',
+                        'Wildcard version constraint can cause unexpected breaking changes',
+                        package=pkg.name, version=pkg.version)
+
+        # Check for unspecified versions
+        for pkg in [p for p in packages
+                    if not p.version or p.version == _UNSPECIFIED]:
+            self._add_issue(
+                'warnings', 'medium',
+                'Version not specified - use explicit versioning',
+                package=pkg.name, version='not specified')
+
+    def _add_issue(self, category: str, severity: str, message: str, **extra):
+        self.issues.append(Issue(category, severity, message, extra))
+
+    def _issues_by_category(self) -> Dict[str, List[Dict]]:
+        """Group the flat issue list into the per-category dict shape the
+        report and JSON output consume."""
+        grouped = {category: [] for category in _ISSUE_CATEGORIES}
+        for issue in self.issues:
+            grouped[issue.category].append({
+                **issue.extra,
+                'severity': issue.severity,
+                'message': issue.message
+            })
+        return grouped
 
     def _generate_summary(self) -> Dict:
         """Generate summary statistics."""
-        total_issues = sum(len(issues) for issues in self.issues.values())
-
-        severity_count = {'high': 0, 'medium': 0, 'low': 0}
-        for category in self.issues.values():
-            for issue in category:
-                if 'severity' in issue:
-                    severity_count[issue['severity']] += 1
+        severity_count = Counter()
+        category_count = Counter()
+        for issue in self.issues:
+            severity_count[issue.severity] += 1
+            category_count[issue.category] += 1
 
         return {
-            'total_issues': total_issues,
-            'by_severity': severity_count,
-            'by_category': {k: len(v) for k, v in self.issues.items()}
+            'total_issues': len(self.issues),
+            'by_severity': {s: severity_count.get(s, 0)
+                            for s in ('high', 'medium', 'low')},
+            'by_category': {c: category_count.get(c, 0)
+                            for c in _ISSUE_CATEGORIES}
         }
 
 
+# Fixed rendering order for the report; iterating these instead of
+# per-analysis dicts keeps the output deterministic run to run.
+_SEVERITY_ORDER = ('high', 'medium', 'low')
+_CATEGORY_ORDER = (
+    ('framework_issues', 'Framework Targeting Issues'),
+    ('outdated', 'Deprecated/Outdated Packages'),
+    ('duplicate_functionality', 'Duplicate Functionality'),
+    ('configuration', 'Configuration Issues'),
+    ('warnings', 'Version Constraint Warnings'),
+)
+
+
 def format_report(analysis: Dict) -> str:
     """Format analysis results as markdown."""
     if not analysis:
         return "No analysis available"
 
-    report = ["# .NET Dependency Analysis Report\n"]
-    report.append(f"**Project:** {analysis['project_name']}")
-    report.append(f"**Target Framework:** {analysis['target_framework']}")
-    report.append(f"**SDK-Style Project:** {'Yes' if analysis['sdk_style'] else 'No (Legacy format)'}")
-    report.append(f"**Package References:** {analysis['total_package_references']}")
-    report.append(f"**Total Issues:** {analysis['summary']['total_issues']}\n")
-
-    report.append("## Summary\n")
-    for severity, count in analysis['summary']['by_severity'].items():
-        if count > 0:
-            report.append(f"- **{severity.upper()}:** {count}")
-    report.append("\n")
+    buf = io.StringIO()
+    buf.write("# .NET Dependency Analysis Report\n")
+    buf.write(f"**Project:** {analysis['project_name']}")
+    buf.write(f"**Target Framework:** {analysis['target_framework']}")
+    buf.write(f"**SDK-Style Project:** {'Yes' if analysis['sdk_style'] else 'No (Legacy format)'}")
+    buf.write(f"**Package References:** {analysis['total_package_references']}")
+    buf.write(f"**Total Issues:** {analysis['summary']['total_issues']}\n")
+
+    by_severity = analysis['summary']['by_severity']
+    buf.write("## Summary\n")
+    buf.write('\n'.join(
+        f"- **{severity.upper()}:** {by_severity[severity]}"
+        for severity in _SEVERITY_ORDER
+        if by_severity.get(severity, 0) > 0))
+    buf.write("\n")
 
     # Issues by category
-    category_names = {
-        'framework_issues': 'Framework Targeting Issues',
-        'outdated': 'Deprecated/Outdated Packages',
-        'duplicate_functionality': 'Duplicate Functionality',
-        'configuration': 'Configuration Issues',
-        'warnings': 'Version Constraint Warnings',
-    }
-
-    for category, name in category_names.items():
+    for category, name in _CATEGORY_ORDER:
         issues = analysis['issues'].get(category, [])
         if issues:
-            report.append(f"## {name} ({len(issues)})\n")
+            buf.write(f"## {name} ({len(issues)})\n")
 
             for issue in issues:
                 if 'package' in issue:
-                    report.append(f"### {issue['package']} ")
+                    buf.write(f"### {issue['package']} ")
                 elif 'framework' in issue:
-                    report.append(f"### {issue['framework']} ")
+                    buf.write(f"### {issue['framework']} ")
                 elif 'setting' in issue:
-                    report.append(f"### {issue['setting']} ")
+                    buf.write(f"### {issue['setting']} ")
                 else:
-                    report.append(f"### Issue ")
+                    buf.write("### Issue ")
 
-                report.append(f"[{issue.get('severity', 'info').upper()}]\n")
-                report.append(f"{issue['message']}\n")
+                buf.write(f"[{issue.get('severity', 'info').upper()}]\n")
+                buf.write(f"{issue['message']}\n")
 
                 if 'version' in issue and 'package' in issue:
-                    report.append(f"- Current version: `{issue['version']}`\n")
+                    buf.write(f"- Current version: `{issue['version']}`\n")
                 if 'packages' in issue:
-                    report.append(f"- Affected packages: {', '.join(issue['packages'])}\n")
+                    buf.write(f"- Affected packages: {', '.join(issue['packages'])}\n")
                 if 'value' in issue:
-                    report.append(f"- Current value: `{issue['value']}`\n")
+                    buf.write(f"- Current value: `{issue['value']}`\n")
 
-                report.append("\n")
+                buf.write("\n")
 
     # Recommendations
-    report.append("## Recommendations\n")
+    buf.write("## Recommendations\n")
     if analysis['summary']['total_issues'] > 0:
-        report.append("1. Update deprecated packages to modern alternatives\n")
-        report.append("2. Upgrade to latest LTS .NET version (.NET 8 as of 2024)\n")
-        report.append("3. Enable nullable reference types for better null safety\n")
-        report.append("4. Enable .NET code analyzers for better code quality\n")
-        report.append("5. Consolidate duplicate functionality to reduce dependencies\n")
-        report.append("6. Run `dotnet list package --vulnerable` to check for security vulnerabilities\n")
-        report.append("7. Run `dotnet list package --outdated` to check for available updates\n")
-        report.append("8. Consider using Directory.Build.props for shared settings across projects\n")
+        buf.write(
+            "1. Update deprecated packages to modern alternatives\n"
+            "2. Upgrade to latest LTS .NET version (.NET 8 as of 2024)\n"
+            "3. Enable nullable reference types for better null safety\n"
+            "4. Enable .NET code analyzers for better code quality\n"
+            "5. Consolidate duplicate functionality to reduce dependencies\n"
+            "6. Run `dotnet list package --vulnerable` to check for security vulnerabilities\n"
+            "7. Run `dotnet list package --outdated` to check for available updates\n"
+            "8. Consider using Directory.Build.props for shared settings across projects\n")
     else:
-        report.append("✅ No major dependency issues detected!\n")
-        report.append("\nRegular maintenance recommendations:\n")
-        report.append("- Run `dotnet list package --vulnerable` monthly\n")
-        report.append("- Run `dotnet list package --outdated` quarterly\n")
-        report.append("- Keep dependencies up to date with security patches\n")
+        buf.write(
+            "✅ No major dependency issues detected!\n"
+            "\nRegular maintenance recommendations:\n"
+            "- Run `dotnet list package --vulnerable` monthly\n"
+            "- Run `dotnet list package --outdated` quarterly\n"
+            "- Keep dependencies up to date with security patches\n")
 
-    return ''.join(report)
+    return buf.getvalue()
 
 
-def main():
-    csproj_path = sys.argv[1] if len(sys.argv) > 1 else 'Project.csproj'
+def _analyze_one(path_str: str, use_cache: bool = True):
+    """Analyze a single csproj (module-level so it pickles to workers).
+
+    Failures are logged and reported as (path, None) so one bad project
+    does not abort a batch run."""
+    try:
+        analyzer = DotNetDependencyAnalyzer(path_str, use_cache=use_cache)
+        return path_str, analyzer.analyze()
+    except (OSError, CsprojParseError) as e:
+        logger.error('analysis failed for %s: %s', path_str, e)
+        return path_str, None
 
-    # If it's a directory, look for .csproj files
-    path = Path(csproj_path)
-    if path.is_dir():
-        csproj_files = list(path.glob('*.csproj'))
+
+def main():
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+
+    json_output = '--json' in sys.argv
+    use_cache = '--no-cache' not in sys.argv
+    args = [a for a in sys.argv[1:] if a not in ('--json', '--no-cache')]
+    csproj_path = args[0] if args else 'Project.csproj'
+
+    # If it's a directory, analyze every .csproj under it. Each file is
+    # an independent CPU-bound parse, so fan out across cores.
+    if os.path.isdir(csproj_path):
+        csproj_files = sorted(glob.iglob(
+            os.path.join(csproj_path, '**', '*.csproj'), recursive=True))
         if not csproj_files:
-            print(f"Error: No .csproj files found in {path}")
+            print(f"Error: No .csproj files found in {csproj_path}")
+            sys.exit(1)
+
+        # Directory input always yields the batch shape — a list of
+        # {path, analysis} objects — so consumers get a stable schema
+        # regardless of how many projects the tree happens to contain.
+        if len(csproj_files) > 1:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=os.cpu_count()) as executor:
+                worker = functools.partial(_analyze_one, use_cache=use_cache)
+                results = list(executor.map(worker, csproj_files, chunksize=4))
+        else:
+            results = [_analyze_one(csproj_files[0], use_cache=use_cache)]
+
+        if use_cache:
+            # Pool workers exit without running atexit hooks, so cache
+            # entries they put never reach disk; persist the batch from
+            # this process instead, with one flush for the whole run.
+            for path_str, analysis in results:
+                if analysis is None:
+                    continue
+                try:
+                    stat = os.stat(path_str)
+                except OSError:
+                    continue
+                _cache_put((os.path.realpath(path_str),
+                            stat.st_mtime_ns, stat.st_size), analysis)
+            _cache_flush()
+
+        failed = any(analysis is None for _, analysis in results)
+        if json_output:
+            print(_dumps([
+                {'path': path_str, 'analysis': analysis}
+                for path_str, analysis in results
+            ]))
+        else:
+            for path_str, analysis in results:
+                print(f"Found .csproj: {path_str}\n")
+                if analysis:
+                    print(format_report(analysis))
+        if failed:
             sys.exit(1)
-        csproj_path = str(csproj_files[0])
-        print(f"Found .csproj: {csproj_path}\n")
+        return
 
-    analyzer = DotNetDependencyAnalyzer(csproj_path)
-    analysis = analyzer.analyze()
+    analyzer = DotNetDependencyAnalyzer(csproj_path, use_cache=use_cache)
+    try:
+        analysis = analyzer.analyze()
+    except (OSError, CsprojParseError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
-    if analysis:
-        report = format_report(analysis)
-        print(report)
+    if json_output:
+        print(_dumps(analysis))
     else:
-        sys.exit(1)
+        print(format_report(analysis))
 
 
 if __name__ == '__main__':
@@ -13,394 +13,619 @@ This script analyzes C# source code to identify:
 - Potential null reference issues
 
 Usage:
-    python detect_code_smells.py [src-dir] [--output json|markdown]
+    python detect_code_smells.py [src-dir] [--output json|markdown] [--jobs N]
+                                  [--cache [dir]] [--no-cache] [--full]
 """
 
+import bisect
+import hashlib
+import mmap
+import os
 import re
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 from collections import defaultdict
 
+try:
+    # google-re2 compiles to a linear-time DFA, which keeps the
+    # backtracking-prone signature patterns below from going quadratic
+    # on pathological source. Optional; the stdlib engine is the fallback.
+    import re2 as _signature_engine
+except ImportError:
+    _signature_engine = re
+
+try:
+    # xxhash is a much faster non-cryptographic hash for cache keys;
+    # blake2b is the stdlib fallback.
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    # orjson serializes several times faster than stdlib json with less
+    # peak memory, which matters for large JSON issue dumps.
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _hash_bytes(data: bytes) -> str:
+    if xxhash is not None:
+        return xxhash.xxh64(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _dumps(obj: Dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+_CACHE_MANIFEST = 'manifest.json'
+# Bump whenever analysis output changes shape or content; a manifest
+# written by any other analyzer version is discarded wholesale so
+# upgrades never replay stale per-file results.
+_CACHE_VERSION = 2
+
+# Collection stops per category once this many issues are held; the
+# markdown report only shows the first ten per severity anyway, and a
+# pathological codebase can emit hundreds of thousands of findings.
+_MAX_PER_CATEGORY = 1000
+
+# All patterns are compiled once at import. The per-line checks used to
+# call re.search/re.findall with string literals inside per-file loops,
+# paying a pattern-cache lookup on every call.
+_METHOD_RE = _signature_engine.compile(
+    r'(?:public|private|protected|internal|static|\s)+[\w<>[\],\s]+\s+(\w+)\s*\([^)]*\)\s*\{')
+_PARAMS_RE = _signature_engine.compile(
+    r'(?:public|private|protected|internal|static|\s)+[\w<>[\],\s]+\s+\w+\s*\(([^)]+)\)')
+_PARAM_SPLIT_RE = re.compile(r',(?![^<>]*>)')
+
+# One alternation instead of twelve separate passes per method body.
+# Word boundaries make '&&'/'||' match reliably and keep 'else if' and
+# '??' from being counted twice.
+_COMPLEXITY_RE = re.compile(
+    r'\b(?:if|else\s+if|for|foreach|while|do|case|catch)\b|&&|\|\||\?\??')
+
+# All per-line checks share one alternation; match.lastgroup routes the
+# hit to the right issue category, so each line is scanned once instead
+# of once per check.
+_COMBINED_LINE_RE = re.compile('|'.join((
+    r'(?P<debug>\b(?:Console\.Write(?:Line)?|Debug\.Write(?:Line)?|Trace\.WriteLine)\()',
+    r'(?P<dynamic>\bdynamic\b)',
+    r'(?P<objcast>\(object\)\s*\w+)',
+    r'(?P<genexc>catch\s*\(\s*Exception\s+\w+\s*\))',
+    r'(?P<marker>(?i:TODO|FIXME|HACK|XXX|BUG|DEPRECATED|UNDONE))',
+    r'(?P<magic>\b\d{2,}\b)',
+)))
+_HIGH_MARKERS = frozenset(['FIXME', 'BUG', 'HACK'])
+_ALLOWED_NUMBERS = frozenset([0, 1, 10, 100, 1000, 60, 24, 365])
+_CONST_RE = re.compile(r'\bconst\b')
+
+# Method-level checks are skipped on files beyond this size — at that
+# scale the file is almost certainly generated and the signature regex
+# plus brace matching would dominate the whole run. Bodies larger than
+# the scan cap are reported as skipped rather than scored.
+_MAX_METHOD_CHECK_CHARS = 200_000
+_MAX_METHOD_BODY_CHARS = 50_000
+
+# Build artifacts, vendored packages, and EF migrations are pruned at
+# the directory level so their trees are never descended into.
+_SKIP_DIRS = frozenset({'bin', 'obj', 'packages', 'TestResults', 'Migrations'})
+# Generated and test files, matched on the file name itself.
+_SKIP_FILE_SUFFIXES = (
+    '.Designer.cs', '.g.cs', '.i.cs',
+    'AssemblyInfo.cs', 'AssemblyAttributes.cs',
+    'Test.cs', 'Tests.cs', 'Spec.cs',
+)
+_EMPTY_CATCH_RE = re.compile(r'catch\s*\([^)]+\)\s*\{\s*(?://[^\n]*)?\s*\}', re.MULTILINE)
+
+
+class _LineIndex:
+    """Maps a content offset to its 1-based line number.
+
+    The newline-offset table is built on first lookup — files whose
+    checks never need a line number pay nothing — and each lookup is a
+    bisect instead of slicing the content and recounting newlines."""
+    __slots__ = ('_content', '_offsets')
+
+    def __init__(self, content: str):
+        self._content = content
+        self._offsets: Optional[List[int]] = None
+
+    def line_at(self, pos: int) -> int:
+        if self._offsets is None:
+            self._offsets = [m.start() for m in re.finditer('\n', self._content)]
+        return bisect.bisect_left(self._offsets, pos) + 1
+
+
+@dataclass(slots=True)
+class Issue:
+    """One finding.
+
+    Slotted instances are a fraction of the size of the per-issue dicts
+    they replace, which matters when a large codebase yields tens of
+    thousands of findings; category-specific fields ride in extra and
+    everything becomes a plain dict again only at the output and cache
+    boundaries."""
+    file: str
+    line: int = 0
+    severity: str = ''
+    message: str = ''
+    code: str = ''
+    extra: Dict = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.severity:
+            # One shared string per severity level across all issues
+            self.severity = sys.intern(self.severity)
+
+    def to_dict(self) -> Dict:
+        d: Dict[str, object] = {'file': self.file}
+        if self.line:
+            d['line'] = self.line
+        if self.severity:
+            d['severity'] = self.severity
+        d['message'] = self.message
+        if self.code:
+            d['code'] = self.code
+        d.update(self.extra)
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> 'Issue':
+        extra = {k: v for k, v in d.items()
+                 if k not in ('file', 'line', 'severity', 'message', 'code')}
+        return cls(d['file'], d.get('line', 0), d.get('severity', ''),
+                   d.get('message', ''), d.get('code', ''), extra)
+
+
 class CSharpCodeSmellDetector:
-    def __init__(self, src_dir: str):
+    def __init__(self, src_dir: str, jobs: Optional[int] = None,
+                 cache_dir: Optional[str] = None,
+                 max_per_category: Optional[int] = _MAX_PER_CATEGORY):
         self.src_dir = Path(src_dir)
-        self.issues = defaultdict(list)
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.max_per_category = max_per_category
+        self.issues: Dict[str, List[Issue]] = defaultdict(list)
+        self.truncated: Dict[str, int] = defaultdict(int)
         self.stats = {
             'total_files': 0,
             'total_lines': 0,
             'total_issues': 0
         }
 
-    def analyze(self):
-        """Run all analysis checks."""
-        for file_path in self.src_dir.rglob('*'):
-            if self._should_analyze(file_path):
-                self.stats['total_files'] += 1
-                self._analyze_file(file_path)
-
-        self.stats['total_issues'] = sum(len(issues) for issues in self.issues.values())
+    def analyze(self) -> Tuple[Dict[str, List['Issue']], Dict]:
+        """Run all analysis checks.
+
+        Files are independent, so analysis fans out across a process
+        pool; chunksize amortizes the pickling round-trips. A single
+        file (or --jobs 1) runs in-process to skip pool startup."""
+        src_dir = str(self.src_dir)
+        paths = list(_iter_source_files(src_dir))
+        self.stats['total_files'] = len(paths)
+
+        # Cached results are keyed by relative path plus content hash,
+        # so edits miss naturally; only the remainder is re-analyzed.
+        manifest = self._load_manifest()
+        new_manifest = {}
+        pending = []
+        pending_keys = []
+        for path in paths:
+            key = None
+            if manifest is not None:
+                try:
+                    with open(path, 'rb') as f:
+                        digest = _hash_bytes(f.read())
+                    key = f'{os.path.relpath(path, src_dir)}:{digest}'
+                except OSError:
+                    key = None
+            if manifest is not None and key is not None and key in manifest:
+                cached = manifest[key]
+                new_manifest[key] = cached
+                self._merge_result(cached['issues'], cached['lines'])
+                continue
+            pending.append(path)
+            pending_keys.append(key)
+
+        jobs = self.jobs or os.cpu_count() or 1
+        if jobs > 1 and len(pending) > 1:
+            worker = partial(analyze_file, src_dir=src_dir)
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(worker, pending, chunksize=16))
+        else:
+            results = [analyze_file(path, src_dir) for path in pending]
+
+        for key, (file_issues, line_count) in zip(pending_keys, results):
+            if key is not None:
+                new_manifest[key] = {'issues': file_issues, 'lines': line_count}
+            self._merge_result(file_issues, line_count)
+
+        if manifest is not None:
+            self._save_manifest(new_manifest)
+
+        self.stats['total_issues'] = (
+            sum(len(issues) for issues in self.issues.values())
+            + sum(self.truncated.values()))
         return self.issues, self.stats
 
-    def _should_analyze(self, path: Path) -> bool:
-        """Check if file should be analyzed."""
-        if not path.is_file():
-            return False
-
-        # Only analyze C# source files
-        valid_extensions = {'.cs'}
-        if path.suffix not in valid_extensions:
-            return False
-
-        # Skip test files, build artifacts, and generated code
-        skip_patterns = [
-            'bin', 'obj', 'packages', 'TestResults',
-            '.Designer.cs', '.g.cs', '.i.cs',  # Generated files
-            'AssemblyInfo.cs', 'AssemblyAttributes.cs',
-            'Migrations',  # EF migrations
-            'Test.cs', 'Tests.cs', 'Spec.cs',  # Test files
-        ]
-        return not any(pattern in str(path) for pattern in skip_patterns)
-
-    def _analyze_file(self, file_path: Path):
-        """Analyze a single C# file for code smells."""
-        try:
-            content = file_path.read_text(encoding='utf-8-sig')  # Handle BOM
-            lines = content.split('\n')
-            self.stats['total_lines'] += len(lines)
+    def _load_manifest(self) -> Optional[Dict]:
+        """Load the cache manifest, or None when caching is disabled.
 
-            rel_path = file_path.relative_to(self.src_dir)
+        An unreadable or corrupt manifest degrades to an empty cache."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, _CACHE_MANIFEST)) as f:
+                payload = json.load(f)
+            if payload.get('version') != _CACHE_VERSION:
+                return {}
+            return {key: {'lines': entry['lines'],
+                          'issues': {cat: [Issue.from_dict(d) for d in items]
+                                     for cat, items in entry['issues'].items()}}
+                    for key, entry in payload['files'].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict) -> None:
+        """Persist the manifest; entries for vanished files drop out
+        because only this run's keys are written back."""
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            files = {key: {'lines': entry['lines'],
+                           'issues': {cat: [issue.to_dict() for issue in items]
+                                      for cat, items in entry['issues'].items()}}
+                     for key, entry in manifest.items()}
+            with open(os.path.join(self.cache_dir, _CACHE_MANIFEST), 'w') as f:
+                json.dump({'version': _CACHE_VERSION, 'files': files}, f)
+        except OSError:
+            pass  # caching is best-effort
+
+    def _merge_result(self, file_issues: Dict, line_count: int) -> None:
+        self.stats['total_lines'] += line_count
+        limit = self.max_per_category
+        for category, items in file_issues.items():
+            held = self.issues[category]
+            if limit is None:
+                held.extend(items)
+                continue
+            room = limit - len(held)
+            if room >= len(items):
+                held.extend(items)
+            else:
+                # Past the cap only the count is kept
+                if room > 0:
+                    held.extend(items[:room])
+                self.truncated[category] += len(items) - max(room, 0)
+
+
+def _iter_source_files(root: str) -> Iterator[str]:
+    """Yield paths of analyzable .cs files under root.
+
+    Iterative os.scandir walk that prunes skipped directories by name
+    before descending, so bin/obj/packages trees are never stat'ed.
+    Works on entry names and paths as strings; Path objects are only
+    built where the analysis needs them."""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in _SKIP_DIRS:
+                        stack.append(entry.path)
+                elif name.endswith('.cs') and not name.endswith(_SKIP_FILE_SUFFIXES):
+                    yield entry.path
+
+def analyze_file(path: str, src_dir: str) -> Tuple[Dict[str, List['Issue']], int]:
+    """Analyze a single C# file for code smells.
+
+    Module-level (rather than a detector method) so it pickles cleanly
+    and can run in worker processes; returns the file's issues by
+    category plus its line count for the caller to merge."""
+    issues: Dict[str, List[Issue]] = defaultdict(list)
+    file_path = Path(path)
+    # One relative-path string shared by every issue this file emits;
+    # the checks take it as str so no per-append Path stringification.
+    rel_path = str(file_path.relative_to(src_dir))
+    line_count = 0
+    try:
+        # Map the file and decode straight from the buffer: one decode
+        # pass, no intermediate bytes copy. read_text() would build the
+        # raw bytes object first and then throw it away.
+        buf: Union[mmap.mmap, bytes]
+        with open(path, 'rb') as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                buf = f.read()  # zero-length files cannot be mapped
+        try:
+            content = str(buf, 'utf-8-sig')  # Handle BOM
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+        lines = content.split('\n')
+        line_count = len(lines)
+        line_index = _LineIndex(content)
 
-            # Check file size
-            self._check_file_size(rel_path, lines)
+        # Check file size
+        _check_file_size(issues, rel_path, lines)
 
+        # Method-level checks; skipped outright on generated-scale files
+        method_checks = len(content) <= _MAX_METHOD_CHECK_CHARS
+        if method_checks:
             # Check method complexity
-            self._check_method_complexity(rel_path, content)
-
-            # Check for technical debt markers
-            self._check_debt_markers(rel_path, lines)
-
-            # Check for debug statements
-            self._check_debug_statements(rel_path, lines)
-
-            # Check for weak typing
-            self._check_weak_typing(rel_path, lines)
-
+            _check_method_complexity(issues, rel_path, content)
+        else:
+            issues['skipped'].append(Issue(
+                rel_path, severity='low',
+                message=f'File has {len(content)} characters; '
+                        f'method-level checks skipped'))
+
+        # Per-line checks (debt markers, debug statements, weak
+        # typing, generic Exception, magic numbers) in one pass
+        _scan_lines(issues, rel_path, lines)
+
+        if method_checks:
             # Check for long parameter lists
-            self._check_long_parameters(rel_path, content)
-
-            # Check for deep nesting
-            self._check_nesting_depth(rel_path, lines)
-
-            # Check for magic numbers
-            self._check_magic_numbers(rel_path, lines)
-
-            # Check for empty catch blocks
-            self._check_empty_catch(rel_path, content)
-
-            # Check for catching generic Exception
-            self._check_generic_exception(rel_path, lines)
-
-            # Check for potential null reference issues
-            self._check_null_references(rel_path, lines)
-
-        except Exception as e:
-            self.issues['errors'].append({
-                'file': str(file_path.relative_to(self.src_dir)),
-                'message': f'Error analyzing file: {str(e)}'
-            })
-
-    def _check_file_size(self, file_path: Path, lines: List[str]):
-        """Check for overly large files."""
-        line_count = len(lines)
-
-        if line_count > 500:
-            severity = 'high' if line_count > 1000 else 'medium'
-            self.issues['large_files'].append({
-                'file': str(file_path),
-                'lines': line_count,
-                'severity': severity,
-                'message': f'File has {line_count} lines (should be < 500)'
-            })
-
-    def _check_method_complexity(self, file_path: Path, content: str):
-        """Check for complex methods."""
-        # Match C# method declarations
-        patterns = [
-            r'(?:public|private|protected|internal|static|\s)+[\w<>[\],\s]+\s+(\w+)\s*\([^)]*\)\s*\{',
-        ]
-
-        for pattern in patterns:
-            for match in re.finditer(pattern, content, re.MULTILINE):
-                method_name = match.group(1)
-
-                # Skip property getters/setters, constructors-like patterns
-                if method_name in ['get', 'set', 'value']:
+            _check_long_parameters(issues, rel_path, content, line_index)
+
+        # Check for deep nesting
+        _check_nesting_depth(issues, rel_path, lines)
+
+        # Check for empty catch blocks
+        _check_empty_catch(issues, rel_path, content, line_index)
+
+    except Exception as e:
+        issues['errors'].append(Issue(
+            rel_path, message=f'Error analyzing file: {str(e)}'))
+    return issues, line_count
+
+
+def _check_file_size(issues: Dict, file_path: str, lines: List[str]) -> None:
+    """Check for overly large files."""
+    line_count = len(lines)
+
+    if line_count > 500:
+        severity = 'high' if line_count > 1000 else 'medium'
+        issues['large_files'].append(Issue(
+            file_path, severity=severity,
+            message=f'File has {line_count} lines (should be < 500)',
+            extra={'lines': line_count}))
+
+def _check_method_complexity(issues: Dict, file_path: str, content: str) -> None:
+    """Check for complex methods."""
+    for match in _METHOD_RE.finditer(content):
+        method_name = match.group(1)
+
+        # Skip property getters/setters, constructors-like patterns
+        if method_name in ['get', 'set', 'value']:
+            continue
+
+        start_pos = match.start()
+
+        # Find method body
+        method_body = _extract_method_body(content, start_pos)
+
+        if method_body is None:
+            # The window cap stopped the scan: the body runs past
+            # _MAX_METHOD_BODY_CHARS, which is exactly the kind of
+            # method worth flagging even though it is too big to score.
+            issues['skipped'].append(Issue(
+                file_path, severity='low',
+                message=f'Method "{method_name}" body exceeds '
+                        f'{_MAX_METHOD_BODY_CHARS} characters; '
+                        f'complexity not analyzed',
+                extra={'method': method_name}))
+            continue
+
+        if method_body:
+            # Count complexity indicators
+            complexity = _calculate_complexity(method_body)
+            lines_in_method = method_body.count('\n')
+
+            if complexity > 10 or lines_in_method > 50:
+                severity = 'high' if complexity > 20 or lines_in_method > 100 else 'medium'
+                issues['complex_methods'].append(Issue(
+                    file_path, severity=severity,
+                    message=f'Method "{method_name}" has complexity {complexity} and {lines_in_method} lines',
+                    extra={'method': method_name, 'complexity': complexity,
+                           'lines': lines_in_method}))
+
+def _extract_method_body(content: str, start_pos: int) -> Optional[str]:
+    """Extract method body using brace matching.
+
+    Jumps from brace to brace with str.find/str.count (C-level scans)
+    instead of walking the body character by character, so the cost
+    tracks the number of closing braces rather than the body length.
+    Returns '' when the body genuinely never closes and None when the
+    search-window cap is what stopped the scan, so the caller can
+    report the oversized method rather than drop it silently."""
+    # Cap the window: no legitimate method body is this long, and the
+    # cap keeps malformed input from forcing a scan to end of file.
+    search_end = min(len(content), start_pos + _MAX_METHOD_BODY_CHARS)
+    capped = search_end < len(content)
+    body_start = content.find('{', start_pos, search_end)
+    if body_start == -1:
+        return None if capped else ''
+
+    depth = 1
+    pos = body_start + 1
+    while True:
+        close_pos = content.find('}', pos, search_end)
+        if close_pos == -1:
+            return None if capped else ''
+        # Every '{' between here and the close deepens; the close itself
+        # pops one level.
+        depth += content.count('{', pos, close_pos) - 1
+        if depth == 0:
+            return content[body_start:close_pos + 1]
+        pos = close_pos + 1
+
+def _calculate_complexity(code: str) -> int:
+    """Calculate cyclomatic complexity."""
+    # Base complexity of 1 plus one per decision point, counted in a
+    # single pass over the body without materializing a match list
+    return 1 + sum(1 for _ in _COMPLEXITY_RE.finditer(code))
+
+def _scan_lines(issues: Dict, file_path: str, lines: List[str]) -> None:
+    """Run all per-line checks in a single pass over the lines.
+
+    One combined alternation finds debt markers, debug statements,
+    weak typing, generic Exception catches, and magic numbers;
+    match.lastgroup routes each hit. Replaces five separate
+    full-file line loops."""
+    for line_num, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if not stripped:
+            continue  # nothing in the alternation matches whitespace
+        first_two = stripped[:2]
+        is_line_comment = first_two == '//'
+        is_block_comment = first_two == '/*'
+        has_comment = '//' in line or '/*' in line
+        # Magic numbers are only reported on plain code lines
+        magic_candidate = not (has_comment or '"' in line
+                               or "'" in line or '[' in line)
+        is_const_line = None  # checked lazily, only if a number shows up
+
+        seen: Set[object] = set()
+        for match in _COMBINED_LINE_RE.finditer(line):
+            group = match.lastgroup
+
+            if group == 'marker':
+                if not has_comment:
                     continue
-
-                start_pos = match.start()
-
-                # Find method body
-                method_body = self._extract_method_body(content, start_pos)
-
-                if method_body:
-                    # Count complexity indicators
-                    complexity = self._calculate_complexity(method_body)
-                    lines_in_method = method_body.count('\n')
-
-                    if complexity > 10 or lines_in_method > 50:
-                        severity = 'high' if complexity > 20 or lines_in_method > 100 else 'medium'
-                        self.issues['complex_methods'].append({
-                            'file': str(file_path),
-                            'method': method_name,
-                            'complexity': complexity,
-                            'lines': lines_in_method,
-                            'severity': severity,
-                            'message': f'Method "{method_name}" has complexity {complexity} and {lines_in_method} lines'
-                        })
-
-    def _extract_method_body(self, content: str, start_pos: int) -> str:
-        """Extract method body using brace matching."""
-        brace_count = 0
-        in_method = False
-        body_start = -1
-
-        for i in range(start_pos, len(content)):
-            if content[i] == '{':
-                if not in_method:
-                    body_start = i
-                    in_method = True
-                brace_count += 1
-            elif content[i] == '}':
-                brace_count -= 1
-                if brace_count == 0 and in_method:
-                    return content[body_start:i+1]
-
-        return ''
-
-    def _calculate_complexity(self, code: str) -> int:
-        """Calculate cyclomatic complexity."""
-        complexity = 1  # Base complexity
-
-        # Count decision points
-        patterns = [
-            r'\bif\b',
-            r'\belse\s+if\b',
-            r'\bfor\b',
-            r'\bforeach\b',
-            r'\bwhile\b',
-            r'\bdo\b',
-            r'\bcase\b',
-            r'\bcatch\b',
-            r'\b&&\b',
-            r'\b\|\|\b',
-            r'\?',  # Ternary operator
-            r'\?\?',  # Null coalescing
-        ]
-
-        for pattern in patterns:
-            complexity += len(re.findall(pattern, code))
-
-        return complexity
-
-    def _check_debt_markers(self, file_path: Path, lines: List[str]):
-        """Check for TODO, FIXME, HACK, XXX comments."""
-        markers = ['TODO', 'FIXME', 'HACK', 'XXX', 'BUG', 'DEPRECATED', 'UNDONE']
-
-        for line_num, line in enumerate(lines, 1):
-            for marker in markers:
-                if marker in line.upper() and ('//' in line or '/*' in line):
-                    # Extract the comment
-                    comment = line.strip()
-                    severity = 'high' if marker in ['FIXME', 'BUG', 'HACK'] else 'low'
-
-                    self.issues['debt_markers'].append({
-                        'file': str(file_path),
-                        'line': line_num,
-                        'marker': marker,
-                        'severity': severity,
-                        'comment': comment,
-                        'message': f'{marker} comment found'
-                    })
-
-    def _check_debug_statements(self, file_path: Path, lines: List[str]):
-        """Check for Console.WriteLine and Debug statements left in code."""
-        patterns = [
-            r'\bConsole\.WriteLine\(',
-            r'\bConsole\.Write\(',
-            r'\bDebug\.WriteLine\(',
-            r'\bDebug\.Write\(',
-            r'\bTrace\.WriteLine\(',
-        ]
-
-        for line_num, line in enumerate(lines, 1):
-            # Skip if it's commented out
-            if line.strip().startswith('//'):
-                continue
-
-            for pattern in patterns:
-                if re.search(pattern, line):
-                    self.issues['debug_statements'].append({
-                        'file': str(file_path),
-                        'line': line_num,
-                        'severity': 'low',
-                        'code': line.strip(),
-                        'message': 'Debug statement left in code'
-                    })
-                    break
-
-    def _check_weak_typing(self, file_path: Path, lines: List[str]):
-        """Check for 'dynamic' type or excessive object casting."""
-        for line_num, line in enumerate(lines, 1):
-            # Skip comments
-            if line.strip().startswith('//') or line.strip().startswith('/*'):
-                continue
-
-            # Check for dynamic keyword
-            if re.search(r'\bdynamic\b', line):
-                self.issues['weak_typing'].append({
-                    'file': str(file_path),
-                    'line': line_num,
-                    'severity': 'medium',
-                    'code': line.strip(),
-                    'message': 'Using "dynamic" type reduces type safety'
-                })
-
-            # Check for object casting patterns
-            if re.search(r'\(object\)\s*\w+', line):
-                self.issues['weak_typing'].append({
-                    'file': str(file_path),
-                    'line': line_num,
-                    'severity': 'low',
-                    'code': line.strip(),
-                    'message': 'Explicit cast to object may indicate design issue'
-                })
-
-    def _check_long_parameters(self, file_path: Path, content: str):
-        """Check for methods with too many parameters."""
-        # Match method signatures
-        pattern = r'(?:public|private|protected|internal|static|\s)+[\w<>[\],\s]+\s+\w+\s*\(([^)]+)\)'
-
-        for match in re.finditer(pattern, content):
-            params = match.group(1).strip()
-
-            if not params:
-                continue
-
-            # Count parameters (simple comma split)
-            # Filter out empty strings and handle generic types
-            param_count = len([p for p in re.split(r',(?![^<>]*>)', params) if p.strip()])
-
-            if param_count > 5:
-                severity = 'high' if param_count > 7 else 'medium'
-                # Find line number
-                line_num = content[:match.start()].count('\n') + 1
-
-                self.issues['long_parameters'].append({
-                    'file': str(file_path),
-                    'line': line_num,
-                    'parameters': param_count,
-                    'severity': severity,
-                    'message': f'Method has {param_count} parameters (should be < 5)'
-                })
-
-    def _check_nesting_depth(self, file_path: Path, lines: List[str]):
-        """Check for deeply nested code."""
-        max_depth = 0
-        current_depth = 0
-
-        for line_num, line in enumerate(lines, 1):
-            # Skip comments and strings
-            stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*'):
-                continue
-
-            # Simple brace counting
-            current_depth += line.count('{') - line.count('}')
-
-            if current_depth > max_depth:
-                max_depth = current_depth
-
-                if current_depth > 4:
-                    severity = 'high' if current_depth > 6 else 'medium'
-                    self.issues['deep_nesting'].append({
-                        'file': str(file_path),
-                        'line': line_num,
-                        'depth': current_depth,
-                        'severity': severity,
-                        'message': f'Nesting depth of {current_depth} (should be < 4)'
-                    })
-
-    def _check_magic_numbers(self, file_path: Path, lines: List[str]):
-        """Check for magic numbers in code."""
-        for line_num, line in enumerate(lines, 1):
-            # Skip comments, strings, and attribute lines
-            if '//' in line or '/*' in line or '"' in line or "'" in line or '[' in line:
-                continue
-
-            # Skip constant declarations
-            if re.search(r'\bconst\b', line):
+                marker = match.group().upper()
+                key = (group, marker)
+                if key in seen:
+                    continue
+                seen.add(key)
+                issues['debt_markers'].append(Issue(
+                    file_path, line_num,
+                    'high' if marker in _HIGH_MARKERS else 'low',
+                    f'{marker} comment found',
+                    extra={'marker': marker, 'comment': stripped}))
                 continue
 
-            # Find numbers that aren't 0, 1, -1, common values
-            numbers = re.findall(r'\b(\d{2,})\b', line)
-
-            for num in numbers:
-                if int(num) not in [0, 1, 10, 100, 1000, 60, 24, 365]:
-                    self.issues['magic_numbers'].append({
-                        'file': str(file_path),
-                        'line': line_num,
-                        'number': num,
-                        'severity': 'low',
-                        'code': line.strip(),
-                        'message': f'Magic number {num} should be a named constant'
-                    })
-                    break  # One per line is enough
-
-    def _check_empty_catch(self, file_path: Path, content: str):
-        """Check for empty catch blocks."""
-        # Match catch blocks with empty or comment-only bodies
-        pattern = r'catch\s*\([^)]+\)\s*\{\s*(?://[^\n]*)?\s*\}'
-
-        for match in re.finditer(pattern, content, re.MULTILINE):
-            line_num = content[:match.start()].count('\n') + 1
-            self.issues['empty_catch'].append({
-                'file': str(file_path),
-                'line': line_num,
-                'severity': 'high',
-                'code': match.group(0).strip(),
-                'message': 'Empty catch block swallows exceptions'
-            })
-
-    def _check_generic_exception(self, file_path: Path, lines: List[str]):
-        """Check for catching generic Exception instead of specific types."""
-        for line_num, line in enumerate(lines, 1):
-            # Look for catch(Exception) but not catch(SpecificException)
-            if re.search(r'catch\s*\(\s*Exception\s+\w+\s*\)', line):
-                self.issues['generic_exception'].append({
-                    'file': str(file_path),
-                    'line': line_num,
-                    'severity': 'medium',
-                    'code': line.strip(),
-                    'message': 'Catching generic Exception; use specific exception types'
-                })
-
-    def _check_null_references(self, file_path: Path, lines: List[str]):
-        """Check for potential null reference issues."""
-        for line_num, line in enumerate(lines, 1):
-            # Skip comments and nullable-enabled contexts
-            if line.strip().startswith('//') or '?' in line:
+            if group in seen:
                 continue
 
-            # Look for direct property access without null check
-            # This is a simple heuristic
-            if re.search(r'\w+\.\w+\.\w+', line) and not re.search(r'\?\.|!=\s*null|==\s*null', line):
-                # Too noisy, skip for now
-                pass
-
-
-def format_markdown_report(issues: Dict, stats: Dict) -> str:
+            if group == 'debug':
+                if is_line_comment:
+                    continue
+                seen.add(group)
+                issues['debug_statements'].append(Issue(
+                    file_path, line_num, 'low',
+                    'Debug statement left in code', stripped))
+            elif group == 'dynamic':
+                if is_line_comment or is_block_comment:
+                    continue
+                seen.add(group)
+                issues['weak_typing'].append(Issue(
+                    file_path, line_num, 'medium',
+                    'Using "dynamic" type reduces type safety', stripped))
+            elif group == 'objcast':
+                if is_line_comment or is_block_comment:
+                    continue
+                seen.add(group)
+                issues['weak_typing'].append(Issue(
+                    file_path, line_num, 'low',
+                    'Explicit cast to object may indicate design issue',
+                    stripped))
+            elif group == 'genexc':
+                seen.add(group)
+                issues['generic_exception'].append(Issue(
+                    file_path, line_num, 'medium',
+                    'Catching generic Exception; use specific exception types',
+                    stripped))
+            elif group == 'magic':
+                if not magic_candidate:
+                    continue
+                if is_const_line is None:
+                    is_const_line = _CONST_RE.search(line) is not None
+                if is_const_line:
+                    continue
+                num = match.group()
+                if int(num) in _ALLOWED_NUMBERS:
+                    continue
+                seen.add(group)  # one per line is enough
+                issues['magic_numbers'].append(Issue(
+                    file_path, line_num, 'low',
+                    f'Magic number {num} should be a named constant', stripped,
+                    extra={'number': num}))
+
+def _check_long_parameters(issues: Dict, file_path: str, content: str,
+                           line_index: _LineIndex) -> None:
+    """Check for methods with too many parameters."""
+    for match in _PARAMS_RE.finditer(content):
+        params = match.group(1).strip()
+
+        if not params:
+            continue
+
+        # Count parameters (simple comma split)
+        # Filter out empty strings and handle generic types
+        param_count = len([p for p in _PARAM_SPLIT_RE.split(params) if p.strip()])
+
+        if param_count > 5:
+            severity = 'high' if param_count > 7 else 'medium'
+            # Find line number
+            line_num = line_index.line_at(match.start())
+
+            issues['long_parameters'].append(Issue(
+                file_path, line_num, severity,
+                f'Method has {param_count} parameters (should be < 5)',
+                extra={'parameters': param_count}))
+
+def _check_nesting_depth(issues: Dict, file_path: str, lines: List[str]) -> None:
+    """Check for deeply nested code."""
+    max_depth = 0
+    current_depth = 0
+
+    for line_num, line in enumerate(lines, 1):
+        # Skip comments and strings; lstrip is enough to classify and
+        # skips re-scanning the tail of the line
+        first_two = line.lstrip()[:2]
+        if first_two == '//' or first_two == '/*':
+            continue
+
+        # Simple brace counting
+        current_depth += line.count('{') - line.count('}')
+
+        if current_depth > max_depth:
+            max_depth = current_depth
+
+            if current_depth > 4:
+                severity = 'high' if current_depth > 6 else 'medium'
+                issues['deep_nesting'].append(Issue(
+                    file_path, line_num, severity,
+                    f'Nesting depth of {current_depth} (should be < 4)',
+                    extra={'depth': current_depth}))
+
+def _check_empty_catch(issues: Dict, file_path: str, content: str,
+                       line_index: _LineIndex) -> None:
+    """Check for empty catch blocks."""
+    # Match catch blocks with empty or comment-only bodies
+    for match in _EMPTY_CATCH_RE.finditer(content):
+        line_num = line_index.line_at(match.start())
+        issues['empty_catch'].append(Issue(
+            file_path, line_num, 'high',
+            'Empty catch block swallows exceptions',
+            match.group(0).strip()))
+
+def format_markdown_report(issues: Dict, stats: Dict,
+                           truncated: Optional[Dict] = None) -> str:
     """Format issues as markdown report."""
     report = ["# Technical Debt Analysis Report (.NET/C#)\n"]
     report.append(f"**Generated:** {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -410,7 +635,7 @@ def format_markdown_report(issues: Dict, stats: Dict) -> str:
     report.append(f"- **Total Issues:** {stats['total_issues']}\n")
 
     # Calculate severity distribution
-    severity_count = defaultdict(int)
+    severity_count: Dict[str, int] = defaultdict(int)
     for category_issues in issues.values():
         for issue in category_issues:
             if 'severity' in issue:
@@ -434,6 +659,7 @@ def format_markdown_report(issues: Dict, stats: Dict) -> str:
         'magic_numbers': 'Magic Numbers',
         'empty_catch': 'Empty Catch Blocks',
         'generic_exception': 'Generic Exception Handling',
+        'skipped': 'Skipped Checks',
         'errors': 'Analysis Errors'
     }
 
@@ -451,22 +677,23 @@ def format_markdown_report(issues: Dict, stats: Dict) -> str:
                 if severity_issues:
                     report.append(f"### {severity} Priority\n")
                     for issue in severity_issues[:10]:  # Limit to 10 per severity
-                        report.append(f"- **{issue['file']}**")
-                        if 'line' in issue:
-                            report.append(f" (line {issue['line']})")
-                        report.append(f": {issue['message']}")
-                        if 'code' in issue:
-                            report.append(f"\n  ```csharp\n  {issue['code']}\n  ```")
-                        report.append("\n")
+                        line_part = f" (line {issue['line']})" if 'line' in issue else ''
+                        code_part = (f"\n  ```csharp\n  {issue['code']}\n  ```"
+                                     if 'code' in issue else '')
+                        report.append(
+                            f"- **{issue['file']}**{line_part}: {issue['message']}{code_part}\n")
 
                     if len(severity_issues) > 10:
                         report.append(f"\n_... and {len(severity_issues) - 10} more_\n")
+            if truncated and truncated.get(category):
+                report.append(f"\n_... {truncated[category]} additional issues "
+                              f"not collected (run with --full)_\n")
             report.append("\n")
 
     return ''.join(report)
 
 
-def main():
+def main() -> None:
     src_dir = sys.argv[1] if len(sys.argv) > 1 else 'src'
     output_format = 'markdown'
 
@@ -475,24 +702,51 @@ def main():
         if idx + 1 < len(sys.argv):
             output_format = sys.argv[idx + 1]
 
+    jobs = None
+    if '--jobs' in sys.argv:
+        idx = sys.argv.index('--jobs')
+        if idx + 1 < len(sys.argv):
+            jobs = int(sys.argv[idx + 1])
+
+    max_per_category: Optional[int] = _MAX_PER_CATEGORY
+    if '--full' in sys.argv:
+        max_per_category = None
+
+    cache_dir = None
+    if '--cache' in sys.argv:
+        cache_dir = '.code_smells_cache'
+        idx = sys.argv.index('--cache')
+        if idx + 1 < len(sys.argv) and not sys.argv[idx + 1].startswith('--'):
+            cache_dir = sys.argv[idx + 1]
+    if '--no-cache' in sys.argv:
+        cache_dir = None
+
     if not Path(src_dir).exists():
         print(f"Error: Source directory not found: {src_dir}")
         sys.exit(1)
 
     print(f"Analyzing C# codebase in: {src_dir}")
 
-    detector = CSharpCodeSmellDetector(src_dir)
+    detector = CSharpCodeSmellDetector(src_dir, jobs=jobs, cache_dir=cache_dir,
+                                       max_per_category=max_per_category)
     issues, stats = detector.analyze()
+    issue_dicts = {category: [issue.to_dict() for issue in items]
+                   for category, items in issues.items()}
 
     if output_format == 'json':
         result = {
             'stats': stats,
-            'issues': dict(issues)
+            'issues': issue_dicts
         }
-        print(json.dumps(result, indent=2))
+        if detector.truncated:
+            result['truncated'] = dict(detector.truncated)
+        print(_dumps(result))
     else:
-        report = format_markdown_report(issues, stats)
-        print(report)
+        report = format_markdown_report(issue_dicts, stats, detector.truncated)
+        # One write of the whole report, bypassing print's per-call work
+        sys.stdout.flush()
+        sys.stdout.buffer.write(report.encode())
+        sys.stdout.buffer.write(b'\n')
 
 
 if __name__ == '__main__':